@@ -1,15 +1,26 @@
 import os
 import openai
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import streamlit as st
 from google.oauth2.service_account import Credentials   
 from googleapiclient.discovery import build
+import anthropic as anthropic_sdk
 from anthropic import Anthropic
+import httpx
 from pathlib import Path
 import re
 import random
+import sqlite3
 import concurrent.futures
+from contextlib import closing
+import functools
+import hashlib
+import tempfile
+import threading
+import time
 from typing import Dict, Tuple
 
 # CONFIG 
@@ -25,6 +36,7 @@ GUIDELINES_FOLDER_ID = st.secrets["GUIDELINES_FOLDER_ID"]
 
 # Fine-tuned model for Adam's rewriting
 FINE_TUNED_MODEL = "ft:gpt-3.5-turbo-1106:affiliation:adam0301:ByHlJhcR"
+REWRITE_SEED = 42  # Fixed seed keeps rewrites reproducible, which the response cache relies on
 
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets.readonly",
@@ -34,39 +46,134 @@ SCOPES = [
 
 DOCS_DRIVE_SCOPES = ["https://www.googleapis.com/auth/documents", "https://www.googleapis.com/auth/drive"]
 
+# Shared HTTP session so GitHub template fetches and the CoinMarketCap call reuse keep-alive connections
+# Transient failures (429/5xx, dropped connections) are retried with exponential backoff: 1s, 2s, 4s
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+))
+SESSION.headers.update({"User-Agent": "writeReviewAdam"})
+HTTP_TIMEOUT = 10  # seconds - fail fast on dead sockets instead of hanging the run
+
+# Templates change rarely - keep fetched copies on disk for an hour
+TEMPLATE_CACHE_DIR = Path.home() / ".review_cache"
+TEMPLATE_CACHE_TTL = 3600  # seconds
+
+# Parsing the service-account key is relatively slow - do it once per process
+@st.cache_resource(show_spinner=False)
 def get_service_account_credentials():
     return Credentials.from_service_account_info(st.secrets["service_account"], scopes=SCOPES)
 
+# Google API clients sit on an httplib2.Http, which is not thread-safe, so each thread (Streamlit script
+# runs, executor workers) builds its own; static_discovery uses the discovery documents bundled with the
+# client library, so building one is cheap and makes no request
+_thread_services = threading.local()
+
+def _get_thread_service(name, version):
+    services = getattr(_thread_services, "services", None)
+    if services is None:
+        services = _thread_services.services = {}
+    if name not in services:
+        services[name] = build(name, version, credentials=get_service_account_credentials(), cache_discovery=False, static_discovery=True)
+    return services[name]
+
+def get_sheets_service():
+    return _get_thread_service("sheets", "v4")
+
+def get_docs_service():
+    return _get_thread_service("docs", "v1")
+
+def get_drive_service():
+    return _get_thread_service("drive", "v3")
+
+def _write_cache_file(path, data):
+    # Write to a temp file and swap it in so concurrent readers never see a partial file
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+        tmp.write(data.encode("utf-8"))
+    os.replace(tmp.name, path)
+
+# One pool for the app's top-level background tasks (data loading, doc lookups), kept across reruns.
+# Fan-outs inside those tasks keep their own short-lived pools - a task waiting on work queued
+# behind it in the same pool could deadlock it.
+@st.cache_resource(show_spinner=False)
+def get_task_executor():
+    return concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="review-task")
+
+def fetch_url_with_disk_cache(url):
+    """GET a URL, serving the body from the on-disk cache while it is younger than the TTL.
+
+    Once the TTL has passed the cached copy is revalidated with its ETag, so an unchanged file
+    costs a bodyless 304 instead of a full download.
+    """
+    cache_file = TEMPLATE_CACHE_DIR / f"{hashlib.sha256(url.encode()).hexdigest()}.txt"
+    etag_file = cache_file.with_suffix(".etag")
+    cached_body = None
+    headers = {}
+    try:
+        cached_body = cache_file.read_bytes().decode("utf-8")
+        if time.time() - cache_file.stat().st_mtime < TEMPLATE_CACHE_TTL:
+            return cached_body
+        headers["If-None-Match"] = etag_file.read_text()
+    except OSError:
+        pass  # No cached copy (or no ETag for it) yet
+
+    response = SESSION.get(url, headers=headers, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304 and cached_body is not None:
+        try:
+            os.utime(cache_file)  # Fresh for another TTL
+        except OSError:
+            pass
+        return cached_body
+    response.raise_for_status()
+
+    try:
+        TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _write_cache_file(cache_file, response.text)
+        if response.headers.get("ETag"):
+            _write_cache_file(etag_file, response.headers["ETag"])
+        else:
+            # An old ETag belongs to the old body - revalidating the new one with it could 304 into wrong content
+            etag_file.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Could not write template cache for {url}: {e}")
+
+    return response.text
+
+# In-process layer over the disk cache, shared by every session and rerun; exceptions are never cached
+@st.cache_data(ttl=TEMPLATE_CACHE_TTL, show_spinner=False)
+def _fetch_url_memoized(url):
+    return fetch_url_with_disk_cache(url)
+
 def get_file_content_from_github(filename):
     """Get content of a file from GitHub repository."""
     try:
         github_base_url = "https://raw.githubusercontent.com/affteamgit/writeReviewAdam/main/templates/"
         file_url = f"{github_base_url}{filename}.txt"
         
-        response = requests.get(file_url)
-        response.raise_for_status()
-        
-        return response.text
+        # Failed fetches raise, so st.cache_data never stores them
+        return _fetch_url_memoized(file_url)
         
     except Exception as e:
         print(f"Error reading file {filename} from GitHub: {str(e)}")
         return None
 
+# Without these no section can be written, so a missing one fails the whole load
+REQUIRED_TEMPLATES = ['PromptTemplate', 'BaseGuidelinesClaude', 'BaseGuidelinesResponsible']
+
 def get_all_templates():
-    """Fetch all templates at once with parallel processing"""
+    """Fetch all templates at once with parallel processing. Raises RuntimeError if a required template is missing."""
     templates = {}
-    files = [
-        'PromptTemplate',
-        'BaseGuidelinesClaude',
-        'BaseGuidelinesResponsible',
-        'StructureTemplateGeneral',
-        'StructureTemplatePayments', 
-        'StructureTemplateGames', 
-        'StructureTemplateResponsible', 
-        'StructureTemplateBonuses'
-    ]
+    # PromptTemplate plus every unique guidelines/structure file the sections use
+    files = ['PromptTemplate']
+    for guidelines_file, structure_file, _ in SECTION_CONFIGS.values():
+        for filename in (guidelines_file, structure_file):
+            if filename not in files:
+                files.append(filename)
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+    # One worker per file so every fetch is in flight at once
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(files)) as executor:
         future_to_file = {executor.submit(get_file_content_from_github, filename): filename 
                          for filename in files}
         
@@ -78,13 +185,21 @@ def get_all_templates():
                 print(f"Error fetching template {filename}: {e}")
                 templates[filename] = None
     
+    missing_templates = [t for t in REQUIRED_TEMPLATES if not templates.get(t)]
+    if missing_templates:
+        raise RuntimeError(f"Could not fetch required templates: {', '.join(missing_templates)}")
+    
     return templates
 
 def get_selected_casino_data():
-    creds = get_service_account_credentials()
-    sheets = build("sheets", "v4", credentials=creds)
-    casino = sheets.spreadsheets().values().get(spreadsheetId=SPREADSHEET_ID, range=f"{SHEET_NAME}!B1").execute().get("values", [[""]])[0][0].strip()
-    rows = sheets.spreadsheets().values().get(spreadsheetId=SPREADSHEET_ID, range=f"{SHEET_NAME}!B2:S").execute().get("values", [])
+    sheets = get_sheets_service()
+    # Read the casino name and the data rows in a single round-trip
+    name_range, data_range = sheets.spreadsheets().values().batchGet(
+        spreadsheetId=SPREADSHEET_ID,
+        ranges=[f"{SHEET_NAME}!B1", f"{SHEET_NAME}!B2:S"]
+    ).execute().get("valueRanges", [{}, {}])
+    casino = name_range.get("values", [[""]])[0][0].strip()
+    rows = data_range.get("values", [])
     sections = {
         "General": (2, 3, 4),
         "Payments": (5, 6, 7),
@@ -95,44 +210,275 @@ def get_selected_casino_data():
     data = {}
     comments_column = 17  # Column S (0-indexed)
     
+    # Bucket every non-empty cell by column in a single pass over the rows
+    # (slicing handles short rows, so no per-column length checks)
+    columns = {i: [] for i in range(2, comments_column + 1)}
+    for r in rows:
+        for i, value in enumerate(r[2:comments_column + 1], start=2):
+            if value.strip():
+                columns[i].append(value)
+    
     # Extract comments from column S
-    all_comments = "\n".join(r[comments_column] for r in rows if len(r) > comments_column and r[comments_column].strip())
+    all_comments = "\n".join(columns[comments_column])
     
     for sec, (mi, ti, si) in sections.items():
-        main = "\n".join(r[mi] for r in rows if len(r) > mi and r[mi].strip())
+        main = "\n".join(columns[mi])
         if ti is not None:
-            top = "\n".join(r[ti] for r in rows if len(r) > ti and r[ti].strip())
+            top = "\n".join(columns[ti])
         else:
             top = "[No top comparison available]"
         if si is not None:
-            sim = "\n".join(r[si] for r in rows if len(r) > si and r[si].strip())
+            sim = "\n".join(columns[si])
         else:
             sim = "[No similar comparison available]"
         data[sec] = {"main": main or "[No data provided]", "top": top, "sim": sim}
     
-    return casino, data, all_comments
+    # B7 holds the link written by the last upload - row 6 of the B2:S range, first column
+    review_link = rows[5][0].strip() if len(rows) > 5 and rows[5] else ""
+    
+    return casino, data, all_comments, review_link
+
+# A few minutes' staleness is fine for a review; failures raise, so they are never cached
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_btc_usd_price():
+    # SESSION retries 429/5xx with backoff (honouring Retry-After) before this raises
+    response = SESSION.get(
+        "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest",
+        headers={"Accepts": "application/json", "X-CMC_PRO_API_KEY": COINMARKETCAP_API_KEY},
+        params={"symbol": "BTC", "convert": "USD"},
+        timeout=HTTP_TIMEOUT
+    )
+    response.raise_for_status()
+    return response.json()["data"]["BTC"]["quote"]["USD"]["price"]
+
+def get_btc_usd_price():
+    """Current BTC price in USD from CoinMarketCap, or None if it can't be fetched."""
+    try:
+        return _fetch_btc_usd_price()
+    except Exception as e:
+        print(f"Error fetching BTC price: {e}")
+        return None
+
+# The header only needs B1; Streamlit reruns on every widget interaction, so don't re-read the sheet each time.
+# Review generation still reads fresh data through get_cached_casino_data.
+@st.cache_data(ttl=60, show_spinner=False)
+def get_casino_name():
+    result = get_sheets_service().spreadsheets().values().get(
+        spreadsheetId=SPREADSHEET_ID,
+        range=f"{SHEET_NAME}!B1"
+    ).execute()
+    return result.get("values", [[""]])[0][0].strip()
 
 def get_cached_casino_data():
     """Get casino data without caching to prevent tone interference"""
     return get_selected_casino_data()
 
 # AI CLIENTS
-client = openai.OpenAI(api_key=OPENAI_API_KEY)
-anthropic = Anthropic(api_key=ANTHROPIC_API_KEY)
-
-def call_openai(prompt):
-    # Add fact constraint system message
-    fact_constraint = "CRITICAL: Only use facts explicitly provided in the prompt. Never add information not in the source data. Do not make assumptions or add general knowledge about casinos."
-    full_prompt = f"{fact_constraint}\n\n{prompt}"
-    return client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": full_prompt}], temperature=0.3, max_tokens=1200).choices[0].message.content.strip()
-
-def call_claude(prompt):
-    # Add fact constraint system message
-    fact_constraint = "CRITICAL: Only use facts explicitly provided in the prompt. Never add information not in the source data. Do not make assumptions or add general knowledge about casinos."
-    full_prompt = f"{fact_constraint}\n\n{prompt}"
-    response = anthropic.messages.create(model="claude-sonnet-5", max_tokens=1200, thinking={"type": "disabled"}, messages=[{"role": "user", "content": full_prompt}])
+# Generation and rewrite fan out across threads, so give each client's connection pool headroom
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+# Explicit timeout and bounded retries (the SDKs back off exponentially and honour Retry-After)
+LLM_TIMEOUT = 60.0  # seconds
+LLM_MAX_RETRIES = 3
+# Upper bound on simultaneous LLM calls from one fan-out (one per review section)
+LLM_MAX_PARALLEL_CALLS = 5
+# Process-wide caps per provider, so overlapping fan-outs (and sessions) can't burst past the rate limits
+OPENAI_SEMAPHORE = threading.BoundedSemaphore(8)
+ANTHROPIC_SEMAPHORE = threading.BoundedSemaphore(5)
+client = openai.OpenAI(
+    api_key=OPENAI_API_KEY,
+    http_client=openai.DefaultHttpxClient(limits=LLM_HTTP_LIMITS),
+    timeout=LLM_TIMEOUT,
+    max_retries=LLM_MAX_RETRIES
+)
+anthropic = Anthropic(
+    api_key=ANTHROPIC_API_KEY,
+    http_client=anthropic_sdk.DefaultHttpxClient(limits=LLM_HTTP_LIMITS),
+    timeout=LLM_TIMEOUT,
+    max_retries=LLM_MAX_RETRIES
+)
+
+# ADAM PERSONA
+def _canonical_prompt(text):
+    """Normalize line endings and trailing spaces so a prompt is byte-identical whatever the editor did to this file."""
+    return "\n".join(line.rstrip() for line in text.replace("\r\n", "\n").split("\n")).strip()
+
+FACT_CONSTRAINT = "CRITICAL: Only use facts explicitly provided in the prompt. Never add information not in the source data. Do not make assumptions or add general knowledge about casinos."
+
+ADAM_BIO = "You are Adam Gros, founder and editor-in-chief of Gamblineers, a seasoned crypto casino expert with over 10 years of experience. Your background is in mathematics and data analysis."
+
+ADAM_STYLE_GUIDE = _canonical_prompt("""
+You write from a first-person singular perspective and speak directly to "you," the reader.
+
+Your voice is analytical, witty, blunt, and honest-with a sharp eye for BS and a deep respect for data. You balance professionalism with dry humor. You call things as they are, whether good or bad, and never sugarcoat reviews.
+
+Writing & Style Rules
+- Always write in first-person singular ("I")
+- Speak directly to you, the reader
+- Keep sentences under 20 words
+- Never use em dashes or emojis
+- Never use fluff words like: "fresh," "solid," "straightforward," "smooth," "game-changer"
+- Avoid clichés: "kept me on the edge of my seat," "whether you're this or that," etc.
+- Bold key facts, bonuses, or red flags
+- Use short paragraphs (2–3 sentences max)
+- Use bullet points for clarity (pros/cons, bonuses, steps, etc.)
+- Tables are optional for comparisons
+- Be helpful without sounding preachy or salesy
+- If something sucks, say it. If it's good, explain why.
+
+Tone
+- Casual but sharp
+- Witty, occasionally sarcastic (in good taste)
+- Confident, never condescending
+- Conversational, never robotic
+- Always honest-even when it hurts
+""")
+
+ADAM_MISSION = _canonical_prompt("""
+Mission & Priorities
+- Save readers from scammy casinos and shady bonus terms
+- Transparency beats hype-user satisfaction > feature lists
+- Crypto usability matters
+- The site serves readers, not casinos
+- Highlight what others overlook-good or bad
+
+Personality Snapshot
+- INTJ: Strategic, opinionated, allergic to buzzwords
+- Meticulous and detail-obsessed
+- Enjoys awkward silences and bad data being called out
+- Prefers dry humor and meaningful critiques.
+""")
+
+# System prompt for the fine-tuned rewrite model
+ADAM_SYSTEM_PROMPT = f"{ADAM_BIO} You are a helpful assistant that rewrites content provided by the user - ONLY THROUGH YOUR TONE AND STYLE, YOU DO NOT CHANGE FACTS or ADD NEW FACTS. YOU REWRITE GIVEN FACTS IN YOUR OWN STYLE.\n\n{ADAM_STYLE_GUIDE}\n\n{ADAM_MISSION}"
+
+# Shared message object so every rewrite request starts with the same system message
+ADAM_SYSTEM_MESSAGE = {"role": "system", "content": ADAM_SYSTEM_PROMPT}
+
+# System prompt for writing new content (overview) in Adam's voice
+ADAM_WRITER_SYSTEM_PROMPT = f"{ADAM_BIO} You are a helpful assistant that writes content in your distinctive voice and style.\n\n{ADAM_STYLE_GUIDE}"
+
+ADAM_TLDR_SYSTEM_PROMPT = "You are Adam Gros, founder and editor-in-chief of Gamblineers. Create concise, analytical TLDR points that capture the essence of casino reviews with your direct, no-nonsense style."
+
+COMMENT_INCORPORATION_PROMPT = _canonical_prompt("""
+You are incorporating feedback comments into a specific section of a casino review.
+
+Section: {section_title}
+Current content:
+{section_content}
+
+All available comments:
+{comments}
+
+Please:
+1. Look for any comments that specifically mention "{section_title}" or are clearly about this section
+2. If you find relevant comments, incorporate that information into the section content
+3. If no comments are relevant to this section, return the original content unchanged
+4. Keep the writing style consistent with the original content
+5. Do NOT include the section header in your response - only return the updated content
+
+Return only the updated section content (without the **{section_title}** header):
+""")
+
+# LLM RESPONSE CACHE
+LLM_CACHE_PATH = Path.home() / ".cache" / "writeReviewAdam.db"
+# Section generation reads live casino data, so its cache is opt-in (LLM_CACHE=1) for debugging and re-runs
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE") == "1"
+LLM_CACHE_TTL = 24 * 3600  # seconds
+
+def _llm_cache_connect():
+    LLM_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(LLM_CACHE_PATH, timeout=10)
+    conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT NOT NULL, created REAL NOT NULL)")
+    return conn
+
+def llm_cache_key(**request):
+    """Hash the full request payload (model, messages, sampling params) into a cache key."""
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+def normalize_whitespace(text):
+    """Collapse runs of whitespace so formatting-only edits in the sheet don't change a cache key."""
+    return " ".join(text.split())
+
+def llm_cache_get(key, max_age=None):
+    """Return the cached response text for a key, or None on a miss or if older than max_age seconds."""
+    try:
+        with closing(_llm_cache_connect()) as conn:
+            row = conn.execute("SELECT content, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        return row[0]
+    except sqlite3.Error as e:
+        print(f"LLM cache read failed: {e}")
+        return None
+
+def llm_cache_set(key, content):
+    """Store a response text under a key. Cache failures never break the caller."""
+    try:
+        with closing(_llm_cache_connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO responses (key, content, created) VALUES (?, ?, ?)", (key, content, time.time()))
+    except sqlite3.Error as e:
+        print(f"LLM cache write failed: {e}")
+
+def cached_call(provider, model, **params):
+    """Cache a call_* function's replies in the LLM cache when LLM_CACHE=1.
+
+    The key covers provider, model, sampling params and the full prompt, so a change to any of them misses.
+    Callers whose prompts carry incidental variation (shuffled lines) can pass their own cache_key built
+    from the underlying inputs instead.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(prompt, cache_prefix="", cache_key=None):
+            if not LLM_CACHE_ENABLED:
+                return fn(prompt, cache_prefix=cache_prefix)
+            key = llm_cache_key(provider=provider, model=model, prompt=cache_key or f"{FACT_CONSTRAINT}\n\n{cache_prefix}{prompt}", **params)
+            cached = llm_cache_get(key, max_age=LLM_CACHE_TTL)
+            if cached is not None:
+                print(f"Using cached {provider} response")
+                return cached
+            reply = fn(prompt, cache_prefix=cache_prefix)
+            if reply:
+                llm_cache_set(key, reply)
+            return reply
+        return wrapper
+    return decorator
+
+@cached_call("openai", "gpt-4o", temperature=0.3, max_tokens=1200)
+def call_openai(prompt, cache_prefix=""):
+    # OpenAI caches repeated prompt prefixes automatically, so the prefix just goes first
+    full_prompt = f"{FACT_CONSTRAINT}\n\n{cache_prefix}{prompt}"
+    with OPENAI_SEMAPHORE:
+        stream = client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": full_prompt}], temperature=0.3, max_tokens=1200, stream=True)
+        return "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices).strip()
+
+@cached_call("anthropic", "claude-sonnet-5", max_tokens=1200)
+def call_claude(prompt, cache_prefix=""):
+    """Call Claude with the fact constraint prepended.
+
+    cache_prefix is text that goes before prompt and repeats across calls; it is sent as its own
+    content block marked for Anthropic prompt caching, so repeats are billed at the cached rate.
+    """
+    if cache_prefix:
+        content = [
+            {"type": "text", "text": f"{FACT_CONSTRAINT}\n\n{cache_prefix}", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": prompt}
+        ]
+    else:
+        content = f"{FACT_CONSTRAINT}\n\n{prompt}"
+    # Stream so tokens start flowing immediately and the read timeout applies per chunk, not to the whole reply
+    with ANTHROPIC_SEMAPHORE, anthropic.messages.stream(model="claude-sonnet-5", max_tokens=1200, thinking={"type": "disabled"}, messages=[{"role": "user", "content": content}]) as stream:
+        response = stream.get_final_message()
     return next(block.text for block in response.content if block.type == "text").strip()
 
+# Section configurations: (guidelines template, structure template, generation function)
+SECTION_CONFIGS = {
+    "General": ("BaseGuidelinesClaude", "StructureTemplateGeneral", call_claude),
+    "Payments": ("BaseGuidelinesClaude", "StructureTemplatePayments", call_claude),
+    "Games": ("BaseGuidelinesClaude", "StructureTemplateGames", call_claude),
+    "Responsible Gambling": ("BaseGuidelinesResponsible", "StructureTemplateResponsible", call_claude),
+    "Bonuses": ("BaseGuidelinesClaude", "StructureTemplateBonuses", call_claude),
+}
+
 def extract_casino_names_from_data(comparison_data):
     """Extract casino names from comparison data string.
     Assumes format like 'CasinoName (link): data...' or '[CasinoName](link): data...'
@@ -222,11 +568,63 @@ def update_used_casinos_tracker(tracker, casino_name):
         tracker.append(casino_name)
     return tracker
 
+# Word stems that tie a comment to one section; used to route short comments without an AI call
+# Whole words only, and only ones that point at a single section - anything vaguer
+# (limits, providers, verification...) is left to the AI sort
+SECTION_KEYWORDS = {
+    "General": ["vpn", "vpns", "reputation", "founded", "license", "licence", "licensed", "licenses", "licences", "licensing"],
+    "Payments": ["deposit", "deposits", "withdraw", "withdrawal", "withdrawals", "kyc", "payment", "payments", "payout", "payouts", "cashout", "cashouts", "cash out"],
+    "Games": ["game", "games", "slot", "slots", "live casino", "live dealer", "live dealers", "blackjack", "roulette", "poker", "rtp"],
+    "Responsible Gambling": ["responsible gambling", "self-exclusion", "self exclusion", "self-excluded", "cool-off", "cooling off", "cooling-off", "reality check", "reality checks", "problem gambling", "gambling addiction"],
+    "Bonuses": ["bonus", "bonuses", "promo", "promos", "promotion", "promotions", "wagering", "free spin", "free spins", "cashback", "rakeback", "vip", "loyalty", "welcome offer"],
+}
+_SECTION_KEYWORD_RES = {
+    sec: re.compile(r"\b(?:" + "|".join(re.escape(word) for word in words) + r")\b", re.IGNORECASE)
+    for sec, words in SECTION_KEYWORDS.items()
+}
+KEYWORD_ROUTING_MAX_WORDS = 40  # Longer comments are left to the AI sort
+
+def route_comments_by_keywords(comments):
+    """Sort short comments by keyword when every line points at exactly one section.
+
+    Returns the same shape as sort_comments_by_section, or None when the comments are long,
+    or any line matches no section or several - those need the AI sort.
+    """
+    if len(comments.split()) > KEYWORD_ROUTING_MAX_WORDS:
+        return None
+    sections = {sec: "" for sec in SECTION_KEYWORDS}
+    for line in comments.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        matches = [sec for sec, pattern in _SECTION_KEYWORD_RES.items() if pattern.search(line)]
+        if len(matches) != 1:
+            return None
+        sec = matches[0]
+        sections[sec] = f"{sections[sec]} {line}" if sections[sec] else line
+    return sections
+
 def sort_comments_by_section(comments):
     """Use AI to intelligently sort comments by section."""
     if not comments or not comments.strip():
         return {"General": "", "Payments": "", "Games": "", "Responsible Gambling": "", "Bonuses": ""}
 
+    # A few clearly-scoped comments don't need a Claude round-trip
+    routed = route_comments_by_keywords(comments)
+    if routed is not None:
+        print("Sorted comments by keyword")
+        return routed
+
+    try:
+        return _sort_comments_with_claude(comments.strip())
+    except Exception as e:
+        print(f"Error sorting comments: {e}")
+        # Fallback: return empty sections
+        return {"General": "", "Payments": "", "Games": "", "Responsible Gambling": "", "Bonuses": ""}
+
+# Reruns with the same sheet comments reuse the sort; failures raise, so they are never cached
+@st.cache_data(ttl=1800, show_spinner=False)
+def _sort_comments_with_claude(comments):
     prompt = f"""Please analyze the following feedback comments and sort them by the casino review sections they belong to.
 
 Comments:
@@ -257,29 +655,24 @@ Format your response exactly like this:
 **Bonuses**
 [relevant comments here or leave empty]"""
     
-    try:
-        response = call_claude(prompt)
-        # Parse the response into a dictionary
-        sections = {"General": "", "Payments": "", "Games": "", "Responsible Gambling": "", "Bonuses": ""}
-        current_section = None
-        
-        for line in response.split('\n'):
-            line = line.strip()
-            if line.startswith('**') and line.endswith('**'):
-                section_name = line[2:-2]  # Remove ** from both ends
-                if section_name in sections:
-                    current_section = section_name
-            elif current_section and line:
-                if sections[current_section]:
-                    sections[current_section] += " " + line
-                else:
-                    sections[current_section] = line
-        
-        return sections
-    except Exception as e:
-        print(f"Error sorting comments: {e}")
-        # Fallback: return empty sections
-        return {"General": "", "Payments": "", "Games": "", "Responsible Gambling": "", "Bonuses": ""}
+    response = call_claude(prompt)
+    # Parse the response into a dictionary
+    sections = {"General": "", "Payments": "", "Games": "", "Responsible Gambling": "", "Bonuses": ""}
+    current_section = None
+    
+    for line in response.split('\n'):
+        line = line.strip()
+        if line.startswith('**') and line.endswith('**'):
+            section_name = line[2:-2]  # Remove ** from both ends
+            if section_name in sections:
+                current_section = section_name
+        elif current_section and line:
+            if sections[current_section]:
+                sections[current_section] += " " + line
+            else:
+                sections[current_section] = line
+    
+    return sections
 
 def incorporate_comments_into_review(review_content, comments):
     """Use AI to incorporate relevant comments into the review before Adam's rewrite."""
@@ -308,23 +701,11 @@ def incorporate_comments_into_review(review_content, comments):
         section_content = section['content']
         
         # Ask AI to incorporate comments for this specific section
-        prompt = f"""You are incorporating feedback comments into a specific section of a casino review.
-
-Section: {section_title}
-Current content:
-{section_content}
-
-All available comments:
-{comments}
-
-Please:
-1. Look for any comments that specifically mention "{section_title}" or are clearly about this section
-2. If you find relevant comments, incorporate that information into the section content
-3. If no comments are relevant to this section, return the original content unchanged
-4. Keep the writing style consistent with the original content
-5. Do NOT include the section header in your response - only return the updated content
-
-Return only the updated section content (without the **{section_title}** header):"""
+        prompt = COMMENT_INCORPORATION_PROMPT.format(
+            section_title=section_title,
+            section_content=section_content,
+            comments=comments
+        )
         
         try:
             updated_content = call_claude(prompt)
@@ -340,76 +721,145 @@ Return only the updated section content (without the **{section_title}** header)
     print("Comment incorporation completed successfully")
     return result
 
+# A line holding just a **Section Name** header (surrounding whitespace allowed); split() keeps the name
+_SECTION_HEADER_RE = re.compile(r'^[^\S\n]*\*\*(General|Payments|Games|Responsible Gambling|Bonuses)\*\*[^\S\n]*$', re.MULTILINE)
+
 def parse_review_sections(content):
     """Parse review content into sections based on **Section Name** format."""
-    section_headers = [
-        "General",
-        "Payments", 
-        "Games",
-        "Responsible Gambling",
-        "Bonuses"
-    ]
-    
-    lines = content.split('\n')
+    # [text before the first header, title, body, title, body, ...]
+    parts = _SECTION_HEADER_RE.split(content)
     sections = []
-    current_section = None
-    current_content = []
     
-    for line in lines:
-        line_stripped = line.strip()
-        
-        # Check if this line is a section header in **Section Name** format
-        is_header = False
-        for header in section_headers:
-            if line_stripped == f"**{header}**":
-                # Save previous section if exists
-                if current_section and current_content:
-                    sections.append({
-                        'title': current_section,
-                        'content': '\n'.join(current_content).strip()
-                    })
-                
-                # Start new section
-                current_section = header
-                current_content = []
-                is_header = True
-                break
-        
-        # If not a header, add to current content
-        if not is_header:
-            if current_section is None:
-                # Skip content before the first section header
+    for i in range(1, len(parts), 2):
+        title, body = parts[i], parts[i + 1]
+        is_last = i + 2 == len(parts)
+        # body starts with the newline ending the header line and, unless it is the last
+        # section, ends with the newline before the next header; a section with no lines is dropped
+        if not body:
+            continue
+        body = body[1:]
+        if not is_last:
+            if not body:
                 continue
-            current_content.append(line)
-    
-    # Don't forget the last section
-    if current_section and current_content:
+            body = body[:-1]
         sections.append({
-            'title': current_section,
-            'content': '\n'.join(current_content).strip()
+            'title': title,
+            'content': body.strip()
         })
     
     return sections
 
+def call_fine_tuned_model(user_content):
+    """Send content to Adam's fine-tuned model and return its reply. Raises on failure."""
+    messages = [
+        ADAM_SYSTEM_MESSAGE,
+        {"role": "user", "content": user_content}
+    ]
+
+    # The rewrite is deterministic (temperature 0, fixed seed), so identical input can be served from the cache
+    cache_key = llm_cache_key(model=FINE_TUNED_MODEL, messages=messages, temperature=0, seed=REWRITE_SEED)
+    cached = llm_cache_get(cache_key, max_age=LLM_CACHE_TTL)
+    if cached is not None:
+        print("Using cached fine-tuned model response")
+        return cached
+
+    with OPENAI_SEMAPHORE:
+        stream = client.chat.completions.create(
+            model=FINE_TUNED_MODEL,
+            messages=messages,
+            temperature=0,
+            seed=REWRITE_SEED,
+            stream=True,
+            timeout=30  # Reduced timeout to 30 seconds - with streaming this bounds each wait for a chunk
+        )
+        parts = []
+        finish_reason = None
+        for chunk in stream:
+            if chunk.choices:
+                parts.append(chunk.choices[0].delta.content or "")
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+    reply = "".join(parts)
+    if not reply:
+        raise ValueError("empty response from fine-tuned model")
+    # Only a reply the model finished on its own is worth replaying - not one cut off at the length limit
+    if finish_reason == "stop":
+        llm_cache_set(cache_key, reply)
+    else:
+        print(f"Fine-tuned model stopped with finish_reason={finish_reason}, not caching the reply")
+    return reply
+
 def rewrite_section(section_title, section_content):
     """Rewrite a single section using the fine-tuned model."""
     try:
         print(f"Rewriting section: {section_title}")
-        response = client.chat.completions.create(
-            model=FINE_TUNED_MODEL,
-            messages=[
-                {"role": "system", "content": "You are Adam Gros, founder and editor-in-chief of Gamblineers, a seasoned crypto casino expert with over 10 years of experience. Your background is in mathematics and data analysis. You are a helpful assistant that rewrites content provided by the user - ONLY THROUGH YOUR TONE AND STYLE, YOU DO NOT CHANGE FACTS or ADD NEW FACTS. YOU REWRITE GIVEN FACTS IN YOUR OWN STYLE.\n\nYou write from a first-person singular perspective and speak directly to \"you,\" the reader.\n\nYour voice is analytical, witty, blunt, and honest-with a sharp eye for BS and a deep respect for data. You balance professionalism with dry humor. You call things as they are, whether good or bad, and never sugarcoat reviews.\n\nWriting & Style Rules\n- Always write in first-person singular (\"I\")\n- Speak directly to you, the reader\n- Keep sentences under 20 words\n- Never use em dashes or emojis\n- Never use fluff words like: \"fresh,\" \"solid,\" \"straightforward,\" \"smooth,\" \"game-changer\"\n- Avoid clichés: \"kept me on the edge of my seat,\" \"whether you're this or that,\" etc.\n- Bold key facts, bonuses, or red flags\n- Use short paragraphs (2–3 sentences max)\n- Use bullet points for clarity (pros/cons, bonuses, steps, etc.)\n- Tables are optional for comparisons\n- Be helpful without sounding preachy or salesy\n- If something sucks, say it. If it's good, explain why.\n\nTone\n- Casual but sharp\n- Witty, occasionally sarcastic (in good taste)\n- Confident, never condescending\n- Conversational, never robotic\n- Always honest-even when it hurts\n\nMission & Priorities\n- Save readers from scammy casinos and shady bonus terms\n- Transparency beats hype-user satisfaction > feature lists\n- Crypto usability matters\n- The site serves readers, not casinos\n- Highlight what others overlook-good or bad\n\nPersonality Snapshot\n- INTJ: Strategic, opinionated, allergic to buzzwords\n- Meticulous and detail-obsessed\n- Enjoys awkward silences and bad data being called out\n- Prefers dry humor and meaningful critiques."},
-                {"role": "user", "content": section_content}
-            ],
-            timeout=30  # Reduced timeout to 30 seconds
-        )
+        rewritten = call_fine_tuned_model(section_content)
         print(f"Successfully rewrote section: {section_title}")
-        return response.choices[0].message.content
+        return rewritten
     except Exception as error:
         error_msg = f"Fine-tuned model failed for {section_title}: {error}"
         print(error_msg)
         return f"[Error rewriting {section_title}]\n{section_content}"
 
+# Most content one batched rewrite request may carry: consecutive sections are packed into groups up to
+# this size (a short review is a single group). The reply has to fit every rewritten section in the group
+# within the model's own output limit (4096 tokens for gpt-3.5-turbo-1106; no max_tokens is set)
+BATCH_REWRITE_MAX_CHARS = 8000
+# The fine-tuned model hasn't been checked for keeping the section markers intact, so batching is opt-in
+# (BATCH_REWRITE=1); by default every section gets its own rewrite request
+BATCH_REWRITE_ENABLED = os.environ.get("BATCH_REWRITE") == "1"
+# Markers are kept out of markdown syntax, since the model escapes markdown it sends back (see fix_bullet_points);
+# backslash-escaped brackets are accepted anyway
+_BATCH_SECTION_RE = re.compile(
+    r'^\\?\[\\?\[SECTION: (.+?)\\?\]\\?\][ \t]*\n(.*?)^\\?\[\\?\[END\\?\]\\?\][ \t]*$',
+    re.MULTILINE | re.DOTALL
+)
+
+def pack_sections_for_batching(sections, max_chars):
+    """Group consecutive sections so each group's content totals at most max_chars.
+
+    A section longer than max_chars ends up in a group of its own.
+    """
+    groups = []
+    current, current_chars = [], 0
+    for section in sections:
+        size = len(section['content'])
+        if current and current_chars + size > max_chars:
+            groups.append(current)
+            current, current_chars = [], 0
+        current.append(section)
+        current_chars += size
+    if current:
+        groups.append(current)
+    return groups
+
+def rewrite_sections_batched(sections):
+    """Rewrite several sections with one fine-tuned call, so the system prompt is sent and billed once.
+
+    Returns {title: rewritten content} for the sections the reply brings back between their markers
+    (empty if the call fails) - the caller rewrites any missing section on its own.
+    """
+    titles = [section['title'] for section in sections]
+    print(f"Rewriting {len(sections)} sections in one request: {titles}")
+    user_content = "Rewrite each section below. Keep every '[[SECTION: <name>]]' and '[[END]]' line exactly as given.\n\n" + "\n\n".join(
+        f"[[SECTION: {section['title']}]]\n{section['content']}\n[[END]]" for section in sections
+    )
+
+    try:
+        reply = call_fine_tuned_model(user_content)
+    except Exception as error:
+        print(f"Batched rewrite failed: {error}")
+        return {}
+
+    rewrites = {}
+    for title, body in _BATCH_SECTION_RE.findall(reply):
+        title = title.replace("\\", "").strip()
+        if title in titles and body.strip():
+            rewrites[title] = body.strip()
+    missing = [title for title in titles if title not in rewrites]
+    if missing:
+        print(f"Batched rewrite didn't return sections {missing} - rewriting them individually")
+    return rewrites
+
 def generate_tldr_points(review_content):
     """Generate 4-5 TLDR bullet points summarizing the entire review."""
     try:
@@ -432,13 +882,15 @@ Create TLDR points that:
 Format your response as exactly 4-5 bullet points, one per line, starting with "- " (dash and space).
 Do not include any introduction or explanation - just the bullet points."""
 
-        response = anthropic.messages.create(
+        # Streamed like call_claude, so the read timeout bounds each chunk rather than the whole reply
+        with ANTHROPIC_SEMAPHORE, anthropic.messages.stream(
             model="claude-sonnet-5",
             max_tokens=500,
             thinking={"type": "disabled"},
-            system="You are Adam Gros, founder and editor-in-chief of Gamblineers. Create concise, analytical TLDR points that capture the essence of casino reviews with your direct, no-nonsense style.",
+            system=ADAM_TLDR_SYSTEM_PROMPT,
             messages=[{"role": "user", "content": tldr_prompt}]
-        )
+        ) as stream:
+            response = stream.get_final_message()
 
         tldr_content = next(block.text for block in response.content if block.type == "text").strip()
 
@@ -483,13 +935,15 @@ CRITICAL: Only reference facts, numbers, and claims that appear in the main poin
 
 Do not repeat information that will be covered in detail in other sections - this should be a high-level introduction that draws readers in."""
 
-        response = anthropic.messages.create(
+        # Streamed like call_claude, so the read timeout bounds each chunk rather than the whole reply
+        with ANTHROPIC_SEMAPHORE, anthropic.messages.stream(
             model="claude-sonnet-5",
             max_tokens=800,
             thinking={"type": "disabled"},
-            system="You are Adam Gros, founder and editor-in-chief of Gamblineers, a seasoned crypto casino expert with over 10 years of experience. Your background is in mathematics and data analysis. You are a helpful assistant that writes content in your distinctive voice and style.\n\nYou write from a first-person singular perspective and speak directly to \"you,\" the reader.\n\nYour voice is analytical, witty, blunt, and honest-with a sharp eye for BS and a deep respect for data. You balance professionalism with dry humor. You call things as they are, whether good or bad, and never sugarcoat reviews.\n\nWriting & Style Rules\n- Always write in first-person singular (\"I\")\n- Speak directly to you, the reader\n- Keep sentences under 20 words\n- Never use em dashes or emojis\n- Never use fluff words like: \"fresh,\" \"solid,\" \"straightforward,\" \"smooth,\" \"game-changer\"\n- Avoid clichés: \"kept me on the edge of my seat,\" \"whether you're this or that,\" etc.\n- Bold key facts, bonuses, or red flags\n- Use short paragraphs (2–3 sentences max)\n- Use bullet points for clarity (pros/cons, bonuses, steps, etc.)\n- Tables are optional for comparisons\n- Be helpful without sounding preachy or salesy\n- If something sucks, say it. If it's good, explain why.\n\nTone\n- Casual but sharp\n- Witty, occasionally sarcastic (in good taste)\n- Confident, never condescending\n- Conversational, never robotic\n- Always honest-even when it hurts",
+            system=ADAM_WRITER_SYSTEM_PROMPT,
             messages=[{"role": "user", "content": overview_prompt}]
-        )
+        ) as stream:
+            response = stream.get_final_message()
 
         overview_content = next(block.text for block in response.content if block.type == "text").strip()
 
@@ -520,18 +974,28 @@ def rewrite_review_with_adam(review_content):
             return rewrite_section("Full Review", review_content)
         
         print(f"Found {len(sections)} sections to rewrite")
-        rewritten_sections = []
-        
-        for i, section in enumerate(sections, 1):
-            print(f"Processing section {i}/{len(sections)}: {section['title']}")
 
-            # Never hand upstream generation errors to the fine-tuned rewrite model -
-            # it doesn't recognize error text as invalid input and will fabricate a
-            # full plausible-sounding section from it instead of flagging the failure.
+        # Never hand upstream generation errors to the fine-tuned rewrite model -
+        # it doesn't recognize error text as invalid input and will fabricate a
+        # full plausible-sounding section from it instead of flagging the failure.
+        # Empty sections have nothing to rewrite either.
+        pending = [s for s in sections if s['content'].strip() and not s['content'].strip().startswith("[Error")]
+
+        # Consecutive sections are packed into as few requests as fit the batch size (the whole
+        # review, for short ones); sections left out of every batch are rewritten on their own
+        groups = []
+        pending_titles = [s['title'] for s in pending]
+        if BATCH_REWRITE_ENABLED and len(set(pending_titles)) == len(pending_titles):
+            groups = [group for group in pack_sections_for_batching(pending, BATCH_REWRITE_MAX_CHARS) if len(group) > 1]
+        batched_ids = {id(section) for group in groups for section in group}
+
+        def rewrite_one(section):
             if section['content'].strip().startswith("[Error"):
                 print(f"Section {section['title']} already failed upstream, skipping rewrite")
-                rewritten_sections.append(f"**{section['title']}**\n{section['content']}")
-                continue
+                return f"**{section['title']}**\n{section['content']}"
+
+            if not section['content'].strip():
+                return f"**{section['title']}**\n{section['content']}"
 
             rewritten_content = rewrite_section(section['title'], section['content'])
 
@@ -539,10 +1003,40 @@ def rewrite_review_with_adam(review_content):
             if rewritten_content.startswith("[Error rewriting"):
                 print(f"Failed to rewrite {section['title']}, using original content")
                 # Use original content if rewrite fails
+                return f"**{section['title']}**\n{section['content']}"
+            return f"**{section['title']}**\n{rewritten_content}"
+
+        # Sections are independent, so the batches and the standalone sections all run at once;
+        # a section its batch reply didn't cover is queued for its own rewrite as soon as that batch returns
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(sections), LLM_MAX_PARALLEL_CALLS)) as executor:
+            batch_futures = {executor.submit(rewrite_sections_batched, group): group for group in groups}
+            for section in sections:
+                if id(section) not in batched_ids:
+                    results[id(section)] = executor.submit(rewrite_one, section)
+
+            for batch_future in concurrent.futures.as_completed(batch_futures):
+                try:
+                    rewrites = batch_future.result() or {}
+                except Exception as e:
+                    print(f"Unexpected error in batched rewrite: {e}")
+                    rewrites = {}
+                for section in batch_futures[batch_future]:
+                    if section['title'] in rewrites:
+                        results[id(section)] = f"**{section['title']}**\n{rewrites[section['title']]}"
+                    else:
+                        results[id(section)] = executor.submit(rewrite_one, section)
+
+        # Collect in the original order; a crash in one section must not discard the others
+        rewritten_sections = []
+        for section in sections:
+            result = results[id(section)]
+            try:
+                rewritten_sections.append(result if isinstance(result, str) else result.result())
+            except Exception as e:
+                print(f"Unexpected error rewriting {section['title']}: {e}, using original content")
                 rewritten_sections.append(f"**{section['title']}**\n{section['content']}")
-            else:
-                rewritten_sections.append(f"**{section['title']}**\n{rewritten_content}")
-        
+
         print("Adam's rewrite process completed successfully")
         return "\n\n".join(rewritten_sections)
         
@@ -694,8 +1188,9 @@ def generate_sections_parallel(casino: str, secs: Dict, sorted_comments: Dict, t
         for sec in section_order if sec in secs
     ]
 
-    # Generate sections in parallel with max 3 workers to avoid API rate limits
-    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+    # Generate all sections at once - one worker per section, so total time is the
+    # slowest section rather than the sum of sections
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(section_data), LLM_MAX_PARALLEL_CALLS) or 1) as executor:
         # Submit all tasks and maintain order
         future_to_section = {
             executor.submit(generate_section_with_assignment, data): data[0]
@@ -715,21 +1210,29 @@ def generate_sections_parallel(casino: str, secs: Dict, sorted_comments: Dict, t
     # Return results in the original section order
     return [results[sec] for sec in section_order if sec in results]
 
+# Placeholders whose values are the same for every casino - a head made only of these can be cached
+CACHEABLE_PROMPT_FIELDS = frozenset({"guidelines", "structure"})
+_PROMPT_FIELD_RE = re.compile(r'\{(\w+)[^{}]*\}')
+
+@functools.lru_cache(maxsize=4)
+def split_prompt_template(prompt_template: str) -> Tuple[str, str]:
+    """Split the prompt template at its first per-casino placeholder, once per template.
+
+    The head holds only fixed text, guidelines and structure, so it is identical across casinos.
+    """
+    for match in _PROMPT_FIELD_RE.finditer(prompt_template):
+        if match.group(1) not in CACHEABLE_PROMPT_FIELDS:
+            # Split at the start of that line, so the head ends on a whole line
+            start = prompt_template.rfind('\n', 0, match.start()) + 1
+            return prompt_template[:start], prompt_template[start:]
+    return "", prompt_template
+
 def generate_section_with_assignment(section_data: Tuple) -> str:
     """Generate section with pre-assigned rotation list of casinos"""
     sec, content, templates, sorted_comments, casino, btc_str, casino_rotation_list = section_data
 
-    # Define section configurations
-    section_configs = {
-        "General": ("BaseGuidelinesClaude", "StructureTemplateGeneral", call_claude),
-        "Payments": ("BaseGuidelinesClaude", "StructureTemplatePayments", call_claude),
-        "Games": ("BaseGuidelinesClaude", "StructureTemplateGames", call_claude),
-        "Responsible Gambling": ("BaseGuidelinesResponsible", "StructureTemplateResponsible", call_claude),
-        "Bonuses": ("BaseGuidelinesClaude", "StructureTemplateBonuses", call_claude),
-    }
-
     try:
-        guidelines_file, structure_file, fn = section_configs[sec]
+        guidelines_file, structure_file, fn = SECTION_CONFIGS[sec]
 
         # Get templates from cached data
         guidelines = templates.get(guidelines_file)
@@ -757,7 +1260,7 @@ def generate_section_with_assignment(section_data: Tuple) -> str:
         random.shuffle(top_lines)
         shuffled_top = '\n'.join(top_lines)
 
-        prompt = prompt_template.format(
+        format_args = dict(
             casino=casino,
             section=sec,
             guidelines=guidelines,
@@ -766,81 +1269,165 @@ def generate_section_with_assignment(section_data: Tuple) -> str:
             top=shuffled_top,
             sim=content["sim"],
             btc_value=btc_str
-        ) + round_robin_instruction
+        )
+
+        # The template's head (fixed text, guidelines and structure - thousands of tokens) doesn't depend
+        # on the casino, so the same section of another review within the cache window reads it cheaply
+        head, body = split_prompt_template(prompt_template)
+        cache_prefix = head.format(**format_args)
+        prompt = body.format(**format_args) + round_robin_instruction
+
+        # Two runs over the same data only differ in the shuffled Top order, so key the response cache
+        # on the inputs themselves rather than the rendered prompt
+        cache_key = llm_cache_key(
+            template=prompt_template,
+            casino=casino,
+            section=sec,
+            guidelines=guidelines,
+            structure=structure,
+            main=normalize_whitespace(content["main"] + section_comments),
+            top=sorted(normalize_whitespace(l) for l in top_lines),
+            sim=normalize_whitespace(content["sim"]),
+            rotation=casino_rotation_list
+        )
 
-        review = fn(prompt)
+        review = fn(prompt, cache_prefix=cache_prefix, cache_key=cache_key)
         return f"**{sec}**\n{review}\n"
 
     except Exception as e:
         print(f"Error generating section {sec}: {e}")
         return f"**{sec}**\n[Error generating section: {str(e)}]\n"
 
-def write_review_link_to_sheet(link):
-    """Write the review link to cell B7 in the spreadsheet."""
-    creds = get_service_account_credentials()
-    sheets = build("sheets", "v4", credentials=creds)
-    body = {"values": [[link]]}
-    sheets.spreadsheets().values().update(
+def write_review_link_to_sheet(link, current_link=None):
+    """Write the review link to cell B7 in the spreadsheet.
+
+    current_link is B7 as last read; when it already equals link (the doc was overwritten in place) the write is skipped.
+    """
+    if current_link == link:
+        print("Review link unchanged, skipping sheet write")
+        return
+    write_cells_to_sheet({"B7": link})
+
+def write_cells_to_sheet(cells: Dict[str, str]):
+    """Write {cell: value} pairs on the review sheet in one values.batchUpdate round-trip."""
+    sheets = get_sheets_service()
+    body = {
+        "valueInputOption": "RAW",
+        "data": [{"range": f"{SHEET_NAME}!{cell}", "values": [[value]]} for cell, value in cells.items()]
+    }
+    sheets.spreadsheets().values().batchUpdate(
         spreadsheetId=SPREADSHEET_ID, 
-        range=f"{SHEET_NAME}!B7", 
-        valueInputOption="RAW", 
         body=body
     ).execute()
 
-def insert_parsed_text_with_formatting(docs_service, doc_id, review_text):
+def iter_markdown_spans(text):
+    """Yield (start, end, kind, value, url) for each **bold** and [text](url) span, left to right.
+
+    A single pass driven by str.find, so malformed input can't trigger regex backtracking.
+    The rules are the ones the old regex used: bold stays on one line, link text has no ']'
+    and the URL is http(s):// with no ')'.
+    """
+    next_bold = text.find('**')
+    next_link = text.find('[')
+    while next_bold != -1 or next_link != -1:
+        end = None
+        if next_link == -1 or (next_bold != -1 and next_bold < next_link):
+            start = next_bold
+            close = text.find('**', start + 2)
+            if close != -1 and text.find('\n', start + 2, close) == -1:
+                end = close + 2
+                yield start, end, "bold", text[start + 2:close], None
+        else:
+            start = next_link
+            close_bracket = text.find(']', start + 1)
+            if close_bracket > start + 1 and text.startswith('(', close_bracket + 1):
+                url_start = close_bracket + 2
+                close_paren = text.find(')', url_start)
+                url = text[url_start:close_paren]
+                if close_paren != -1 and ((url.startswith('https://') and len(url) > 8) or (url.startswith('http://') and len(url) > 7)):
+                    end = close_paren + 1
+                    yield start, end, "link", text[start + 1:close_bracket], url
+
+        # Continue after a match, or one character on if this candidate wasn't one
+        resume = end if end is not None else start + 1
+        if next_bold != -1 and next_bold < resume:
+            next_bold = text.find('**', resume)
+        if next_link != -1 and next_link < resume:
+            next_link = text.find('[', resume)
+
+def _doc_len(text):
+    """Length of text in Google Docs index units (UTF-16 code units)."""
+    return len(text.encode('utf-16-le')) // 2
+
+# Bold lines with these titles get header styling in the doc
+REVIEW_SECTION_TITLES = frozenset({"Overview", "General", "Payments", "Games", "Responsible Gambling", "Bonuses"})
+
+def build_review_requests(review_text):
+    """Turn markdown-ish review text into Docs requests: one insertText at index 1 followed by all styling."""
     # Parse the text into clean text and extract formatting positions
-    plain_text = ""
+    parts = []  # joined once at the end - repeated += on a long review is quadratic
     formatting_requests = []
     cursor = 1  # Google Docs uses 1-based index after the title
 
-    pattern = r'(\*\*(.*?)\*\*|\[([^\]]+?)\]\((https?://[^\)]+)\))'
     last_end = 0
 
-    for match in re.finditer(pattern, review_text):
-        start, end = match.span()
+    for start, end, kind, value, url in iter_markdown_spans(review_text):
         before_text = review_text[last_end:start]
-        plain_text += before_text
-        cursor_start = cursor + len(before_text)
-
-        if match.group(2):  # Bold (**text**)
-            bold_text = match.group(2)
-            plain_text += bold_text
+        parts.append(before_text)
+        cursor_start = cursor + _doc_len(before_text)
+
+        if kind == "bold" and value:  # Bold (**text**)
+            bold_text = value
+            parts.append(bold_text)
+
+            # A bold section title alone on its line is a section header - style it
+            # here, while its offset is known, instead of searching for it afterwards
+            line_begin = review_text.rfind('\n', 0, start) + 1
+            line_end = review_text.find('\n', end)
+            if line_end == -1:
+                line_end = len(review_text)
+            is_header = (
+                bold_text.strip() in REVIEW_SECTION_TITLES
+                and not review_text[line_begin:start].strip()
+                and not review_text[end:line_end].strip()
+            )
+
+            if is_header:
+                text_style = {"bold": True, "fontSize": {"magnitude": 16, "unit": "PT"}}
+                fields = "bold,fontSize"
+            else:
+                text_style = {"bold": True}
+                fields = "bold"
             formatting_requests.append({
                 "updateTextStyle": {
-                    "range": {"startIndex": cursor_start, "endIndex": cursor_start + len(bold_text)},
-                    "textStyle": {"bold": True},
-                    "fields": "bold"
+                    "range": {"startIndex": cursor_start, "endIndex": cursor_start + _doc_len(bold_text)},
+                    "textStyle": text_style,
+                    "fields": fields
                 }
             })
-            cursor += len(before_text) + len(bold_text)
+            cursor += _doc_len(before_text) + _doc_len(bold_text)
 
-        elif match.group(3) and match.group(4):  # Link [text](url)
-            link_text = match.group(3)
-            url = match.group(4)
-            plain_text += link_text
+        elif kind == "link":  # Link [text](url)
+            link_text = value
+            parts.append(link_text)
             formatting_requests.append({
                 "updateTextStyle": {
-                    "range": {"startIndex": cursor_start, "endIndex": cursor_start + len(link_text)},
+                    "range": {"startIndex": cursor_start, "endIndex": cursor_start + _doc_len(link_text)},
                     "textStyle": {"link": {"url": url}},
                     "fields": "link"
                 }
             })
-            cursor += len(before_text) + len(link_text)
+            cursor += _doc_len(before_text) + _doc_len(link_text)
 
         last_end = end
 
     remaining_text = review_text[last_end:]
-    plain_text += remaining_text
-
-    #  Insert clean plain text first
-    docs_service.documents().batchUpdate(
-        documentId=doc_id,
-        body={"requests": [{"insertText": {"location": {"index": 1}, "text": plain_text}}]}
-    ).execute()
+    parts.append(remaining_text)
+    plain_text = "".join(parts)
 
     title_line = plain_text.split('\n', 1)[0]
     title_start = 1
-    title_end = title_start + len(title_line)
+    title_end = title_start + _doc_len(title_line)
 
     formatting_requests.insert(0, {
     "updateParagraphStyle": {
@@ -850,54 +1437,63 @@ def insert_parsed_text_with_formatting(docs_service, doc_id, review_text):
         }
     })
 
-    # Apply inline bold & links
-    if formatting_requests:
-        docs_service.documents().batchUpdate(
-            documentId=doc_id,
-            body={"requests": formatting_requests}
-        ).execute()
-
-    doc = docs_service.documents().get(documentId=doc_id).execute()
-    header_requests = []
-    section_titles = ["Overview", "General", "Payments", "Games", "Responsible Gambling", "Bonuses"]
-
-    for element in doc.get('body', {}).get('content', []):
-        if 'paragraph' in element:
-            paragraph = element['paragraph']
-            paragraph_text = ''.join(
-                elem['textRun']['content']
-                for elem in paragraph.get('elements', [])
-                if 'textRun' in elem
-            ).strip()
-
-            # Check if this is a section title
-            if paragraph_text in section_titles:
-                # Find the exact start and end from element indexes
-                start_index = element.get('startIndex')
-                end_index = element.get('endIndex')
-                if start_index is not None and end_index is not None:
-                    header_requests.append({
-                        "updateTextStyle": {
-                            "range": {"startIndex": start_index, "endIndex": end_index - 1},  # exclude trailing newline
-                            "textStyle": {"bold": True, "fontSize": {"magnitude": 16, "unit": "PT"}},
-                            "fields": "bold,fontSize"
-                        }
-                    })
-
-    # Apply section headers formatting
-    if header_requests:
-        docs_service.documents().batchUpdate(
-            documentId=doc_id,
-            body={"requests": header_requests}
-        ).execute()
+    # Insert the clean text, then apply title, inline bold, links and headers
+    return [{"insertText": {"location": {"index": 1}, "text": plain_text}}] + formatting_requests
+
+def insert_parsed_text_with_formatting(docs_service, doc_id, review_text):
+    # Text and all formatting go out in a single call
+    docs_service.documents().batchUpdate(
+        documentId=doc_id,
+        body={"requests": build_review_requests(review_text)}
+    ).execute()
+
+def get_doc_end_index(docs_service, doc_id):
+    # Only the end index is needed - skip downloading the whole old document
+    doc = docs_service.documents().get(documentId=doc_id, fields="body.content(endIndex)").execute()
+    return doc.get('body', {}).get('content', [{}])[-1].get('endIndex', 1)
+
+def overwrite_google_doc(docs_service, doc_id, review_text, end_index=None):
+    """Replace the body of an existing doc in one batchUpdate, keeping its ID, URL, folder and sharing.
+
+    end_index can be passed in when it was fetched ahead of time; otherwise it is read first.
+    """
+    if end_index is None:
+        end_index = get_doc_end_index(docs_service, doc_id)
+
+    requests = []
+    # The final newline of a document can't be deleted, so clear everything before it
+    if end_index > 2:
+        requests.append({"deleteContentRange": {"range": {"startIndex": 1, "endIndex": end_index - 1}}})
+
+    insert_request, *formatting_requests = build_review_requests(review_text)
+    inserted_range = {"startIndex": 1, "endIndex": 1 + _doc_len(insert_request["insertText"]["text"])}
+    requests.append(insert_request)
+    # New text inherits whatever style sat at index 1 (the old title) - reset before reformatting
+    requests.append({
+        "updateParagraphStyle": {
+            "range": inserted_range,
+            "paragraphStyle": {"namedStyleType": "NORMAL_TEXT"},
+            "fields": "namedStyleType"
+        }
+    })
+    requests.append({
+        "updateTextStyle": {
+            "range": inserted_range,
+            "textStyle": {},
+            "fields": "bold,fontSize,link"
+        }
+    })
+    requests.extend(formatting_requests)
+
+    docs_service.documents().batchUpdate(documentId=doc_id, body={"requests": requests}).execute()
 
 def create_google_doc_in_folder(docs_service, drive_service, folder_id, doc_title, review_text):
-    doc_id = docs_service.documents().create(body={"title": doc_title}).execute()["documentId"]
+    # Create the doc straight inside the folder - no move (get parents + update) afterwards
+    doc_id = drive_service.files().create(
+        body={"name": doc_title, "mimeType": "application/vnd.google-apps.document", "parents": [folder_id]},
+        fields="id"
+    ).execute()["id"]
     insert_parsed_text_with_formatting(docs_service, doc_id, review_text)
-
-    file = drive_service.files().get(fileId=doc_id, fields="parents").execute()
-    previous_parents = ",".join(file.get('parents', []))
-    drive_service.files().update(fileId=doc_id, addParents=folder_id, removeParents=previous_parents, fields="id, parents").execute()
     return doc_id
 
 def find_existing_doc(drive_service, folder_id, title):
@@ -906,6 +1502,24 @@ def find_existing_doc(drive_service, folder_id, title):
     files = results.get("files", [])
     return files[0]["id"] if files else None
 
+def upload_review_doc(docs_service, drive_service, folder_id, doc_title, review_text, known_doc_id=None, known_end_index=None):
+    """Write the review to the folder's doc with this title, overwriting it in place if it already exists.
+
+    known_doc_id (and optionally its known_end_index) come from an earlier lookup; if overwriting
+    it fails (e.g. it was deleted or edited since), the folder is searched again.
+    """
+    if known_doc_id:
+        try:
+            overwrite_google_doc(docs_service, known_doc_id, review_text, end_index=known_end_index)
+            return known_doc_id
+        except Exception as e:
+            print(f"Could not overwrite doc {known_doc_id}, looking it up again: {e}")
+    existing_doc_id = find_existing_doc(drive_service, folder_id, doc_title)
+    if existing_doc_id:
+        overwrite_google_doc(docs_service, existing_doc_id, review_text)
+        return existing_doc_id
+    return create_google_doc_in_folder(docs_service, drive_service, folder_id, doc_title, review_text)
+
 def main():
     st.set_page_config(page_title="Merged Review Generator", layout="centered", initial_sidebar_state="collapsed")
     
@@ -972,14 +1586,35 @@ def main():
             if st.button("Generate Overview & Post to Google Docs", type="primary", disabled=not (keyword and main_points)):
                 if keyword and main_points:
                     try:
+                        docs_service = get_docs_service()
+                        drive_service = get_drive_service()
+                        known_doc_id = st.session_state.get("review_doc_id")
+
                         # Generate overview section with selected TLDR points
                         st.info("🔄 Generating Overview section with Adam's voice...")
-                        overview_section = generate_overview_section(
-                            st.session_state.casino_name,
-                            keyword,
-                            main_points,
-                            selected_tldr_points if selected_tldr_points else None
-                        )
+                        # Read the existing doc's length while the overview is written
+                        end_index_future = get_task_executor().submit(lambda: get_doc_end_index(get_docs_service(), known_doc_id)) if known_doc_id else None
+                        # If the previous attempt failed after writing the overview (e.g. on upload),
+                        # retrying with exactly the same inputs reuses it instead of calling Claude again
+                        overview_inputs = (st.session_state.casino_name, keyword, main_points, tuple(selected_tldr_points))
+                        pending_overview = st.session_state.get("pending_overview")
+                        if pending_overview and pending_overview[0] == overview_inputs:
+                            overview_section = pending_overview[1]
+                        else:
+                            overview_section = generate_overview_section(
+                                st.session_state.casino_name,
+                                keyword,
+                                main_points,
+                                selected_tldr_points if selected_tldr_points else None
+                            )
+                            if "\n[Error generating Overview section" not in overview_section:
+                                st.session_state.pending_overview = (overview_inputs, overview_section)
+                        known_end_index = None
+                        if end_index_future is not None:
+                            try:
+                                known_end_index = end_index_future.result()
+                            except Exception as e:
+                                print(f"Could not read existing review doc: {e}")
                         
                         # Combine overview with the rest of the review - Overview goes first
                         title_line = f"{st.session_state.casino_name} review"
@@ -998,27 +1633,20 @@ def main():
 
                         # Post to Google Docs
                         st.info("📤 Uploading to Google Drive...")
-                        user_creds = get_service_account_credentials()
-                        docs_service = build("docs", "v1", credentials=user_creds)
-                        drive_service = build("drive", "v3", credentials=user_creds)
-                        
                         doc_title = f"{st.session_state.casino_name} Review"
-                        existing_doc_id = find_existing_doc(drive_service, FOLDER_ID, doc_title)
-
-                        if existing_doc_id:
-                            drive_service.files().delete(fileId=existing_doc_id).execute()
-
-                        doc_id = create_google_doc_in_folder(docs_service, drive_service, FOLDER_ID, doc_title, final_review)
+                        doc_id = upload_review_doc(docs_service, drive_service, FOLDER_ID, doc_title, final_review, known_doc_id=known_doc_id, known_end_index=known_end_index)
                         doc_url = f"https://docs.google.com/document/d/{doc_id}"
                         
                         # Write the review link to the spreadsheet
-                        write_review_link_to_sheet(doc_url)
+                        write_review_link_to_sheet(doc_url, current_link=st.session_state.get("sheet_review_link"))
+                        st.session_state.sheet_review_link = doc_url
                         
                         # Mark as completed
                         st.session_state.review_completed = True
                         st.session_state.review_url = doc_url
                         st.session_state.awaiting_overview = False
                         st.session_state.rewritten_review = None
+                        st.session_state.pending_overview = None
                         if 'tldr_points' in st.session_state:
                             del st.session_state.tldr_points
 
@@ -1032,15 +1660,10 @@ def main():
                 try:
                     # Post to Google Docs without overview - using exact original workflow
                     st.info("📤 Uploading to Google Drive...")
-                    user_creds = get_service_account_credentials()
-                    docs_service = build("docs", "v1", credentials=user_creds)
-                    drive_service = build("drive", "v3", credentials=user_creds)
+                    docs_service = get_docs_service()
+                    drive_service = get_drive_service()
                     
                     doc_title = f"{st.session_state.casino_name} Review"
-                    existing_doc_id = find_existing_doc(drive_service, FOLDER_ID, doc_title)
-
-                    if existing_doc_id:
-                        drive_service.files().delete(fileId=existing_doc_id).execute()
 
                     # Use original review format - exactly as it was before
                     final_review = f"{st.session_state.casino_name} review\n\n{st.session_state.rewritten_review}"
@@ -1056,17 +1679,19 @@ def main():
                         st.session_state.casino_name
                     )
 
-                    doc_id = create_google_doc_in_folder(docs_service, drive_service, FOLDER_ID, doc_title, final_review)
+                    doc_id = upload_review_doc(docs_service, drive_service, FOLDER_ID, doc_title, final_review, known_doc_id=st.session_state.get("review_doc_id"))
                     doc_url = f"https://docs.google.com/document/d/{doc_id}"
                     
                     # Write the review link to the spreadsheet
-                    write_review_link_to_sheet(doc_url)
+                    write_review_link_to_sheet(doc_url, current_link=st.session_state.get("sheet_review_link"))
+                    st.session_state.sheet_review_link = doc_url
                     
                     # Mark as completed
                     st.session_state.review_completed = True
                     st.session_state.review_url = doc_url
                     st.session_state.awaiting_overview = False
                     st.session_state.rewritten_review = None
+                    st.session_state.pending_overview = None
                     if 'tldr_points' in st.session_state:
                         del st.session_state.tldr_points
 
@@ -1092,13 +1717,14 @@ def main():
             st.session_state.awaiting_overview = False
             if 'tldr_points' in st.session_state:
                 del st.session_state.tldr_points
+            # The next casino is usually selected in the sheet by now - don't show the old name
+            get_casino_name.clear()
             st.rerun()
         return
     
     # Get casino name first to show in the interface
     try:
-        user_creds = get_service_account_credentials()
-        casino, _, _ = get_cached_casino_data()
+        casino = get_casino_name()
         st.session_state.casino_name = casino
     except Exception as e:
         st.error(f"❌ Error loading casino data: {e}")
@@ -1115,38 +1741,31 @@ def main():
         progress_placeholder.markdown("## Writing review, please wait...")
         
         try:
-            docs_service = build("docs", "v1", credentials=user_creds)
-            drive_service = build("drive", "v3", credentials=user_creds)
-
             # Load all data in parallel
             progress_placeholder.markdown("## Loading templates and data...")
             
-            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-                # Submit all data loading tasks
-                templates_future = executor.submit(get_all_templates)
-                casino_data_future = executor.submit(get_cached_casino_data)
-                btc_future = executor.submit(
-                    lambda: requests.get(
-                        "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest",
-                        headers={"Accepts": "application/json", "X-CMC_PRO_API_KEY": COINMARKETCAP_API_KEY},
-                        params={"symbol": "BTC", "convert": "USD"}
-                    ).json().get("data", {}).get("BTC", {}).get("quote", {}).get("USD", {}).get("price")
-                )
-                
-                # Collect results
+            executor = get_task_executor()
+            # Submit all data loading tasks
+            templates_future = executor.submit(get_all_templates)
+            casino_data_future = executor.submit(get_cached_casino_data)
+            btc_future = executor.submit(get_btc_usd_price)
+            
+            # Collect results - templates first, so a missing one stops the run before anything else is awaited
+            try:
                 templates = templates_future.result()
-                casino, secs, comments = casino_data_future.result()
-                price = btc_future.result()
+            except RuntimeError as e:
+                # Drop the sibling loads if they haven't started yet
+                casino_data_future.cancel()
+                btc_future.cancel()
+                progress_placeholder.empty()
+                st.error(f"Error: {e}")
+                return
+            casino, secs, comments, review_link = casino_data_future.result()
+            st.session_state.sheet_review_link = review_link
+            price = btc_future.result()
             
             btc_str = f"1 BTC = ${price:,.2f}" if price else "[BTC price unavailable]"
             
-            # Check if all required templates were loaded
-            required_templates = ['PromptTemplate', 'BaseGuidelinesClaude', 'BaseGuidelinesResponsible']
-            missing_templates = [t for t in required_templates if not templates.get(t)]
-            if missing_templates:
-                st.error(f"Error: Could not fetch required templates: {', '.join(missing_templates)}")
-                return
-            
             # Sort comments by section using AI
             progress_placeholder.markdown("## Sorting comments by section...")
             sorted_comments = sort_comments_by_section(comments)
@@ -1185,12 +1804,20 @@ def main():
 
             initial_review = "\n".join(out)
 
+            # Look up the review doc while the rewrite runs, so finalizing can skip the Drive search
+            doc_lookup_future = get_task_executor().submit(lambda: find_existing_doc(get_drive_service(), FOLDER_ID, f"{casino} Review"))
             rewritten_review = rewrite_review_with_adam(initial_review)
+            try:
+                st.session_state.review_doc_id = doc_lookup_future.result()
+            except Exception as e:
+                print(f"Could not look up existing review doc: {e}")
+                st.session_state.review_doc_id = None
 
             # Step 3: Store rewritten review and casino links, then prompt for Overview input
             st.session_state.rewritten_review = rewritten_review
             st.session_state.casino_links_map = casino_links_map
             st.session_state.awaiting_overview = True
+            st.session_state.pending_overview = None
             st.session_state.casino_name = casino
             
             # Clear progress message and show overview input screen